@@ -1,123 +1,477 @@
 import requests
+from requests.adapters import HTTPAdapter
+from urllib3.util.retry import Retry
+from urllib.parse import parse_qsl, urlencode, urlsplit, urlunsplit
+import httpx
+import asyncio
 import argparse
-import json
-from typing import Dict, Any, List
+import orjson
+import os
+import sqlite3
+import threading
+import time
+from datetime import timedelta
+from functools import lru_cache
+from typing import Dict, Any, Callable, List, Optional, Set, Tuple
 from duckduckgo_search import DDGS
 from bs4 import BeautifulSoup
 import tldextract
-import time
-from urllib.parse import urlparse
 import re
+import string
+from concurrent.futures import ThreadPoolExecutor
+
+try:
+    from selectolax.lexbor import LexborHTMLParser as HTMLParser
+except ImportError:
+    # Fall back to BeautifulSoup with the lxml backend
+    HTMLParser = None
+
+# Per-source cap on scraped text fed to the model; prompt prefill scales with it
+MAX_CONTEXT_CHARS = 2000
+
+# Stop downloading a page after this many bytes; far more than the text we keep
+MAX_BODY_BYTES = 512 * 1024
+
+# How long Ollama keeps the model resident after a request
+KEEP_ALIVE = "30m"
+
+# Connections kept open to Ollama; also caps how many analyses run at once
+OLLAMA_POOL_SIZE = 8
+
+# Total critique text pasted into the synthesis turn. With num_ctx 8192 the history
+# already holds the web context (~2.5k tokens) and the initial answer (up to
+# num_predict), and num_predict more is reserved for the reply, so longer critiques
+# would make Ollama silently drop the start of the prompt.
+MAX_CRITIQUE_CHARS = 4000
+
+SYSTEM_PROMPT = "You are a research assistant. Ground your answers in the provided web search results and cite their URLs."
+
+_RESEARCH_TEMPLATE = string.Template("""Provide a comprehensive analysis of the following question:
+
+$question
+
+$web_context
+
+Please provide a detailed response that includes:
+1. Key concepts and definitions
+2. Historical context (if relevant)
+3. Current state of knowledge
+4. Different perspectives or viewpoints
+5. Supporting evidence and examples
+6. Potential implications
+7. Areas for further research
+8. Citations and sources (include URLs from the web results)
+
+Structure your response in a clear, academic format with appropriate sections and subsections.""")
+
+_ANALYSIS_TEMPLATE = string.Template("""Now critique your previous answer against the question and the web search results above, and provide a deeper analysis.
+Focus especially on $focus.
+
+1. Critical analysis of the information presented
+2. Identification of any gaps or limitations
+3. Connections to related fields or concepts
+4. Practical applications or implications
+5. Recommendations for further investigation
+6. Fact-checking against web sources
+7. Additional insights from web sources""")
+
+# Parallel analyses each take a different angle so they don't repeat one another
+_ANALYSIS_FOCUSES = [
+    "factual accuracy: check each claim against the web sources",
+    "gaps, limitations, and missing perspectives",
+    "connections to related fields and practical implications",
+]
+
+_SYNTHESIS_TEMPLATE = string.Template("""Independent critiques of your initial research:
+
+$analyses
+
+Based on the research question, your initial research, and these critiques, provide a final synthesis.
+
+Sources:
+$source_list
+
+Please provide:
+1. A comprehensive synthesis of all findings
+2. Key takeaways and conclusions
+3. Practical implications
+4. Recommendations for further research
+5. Citations and sources
+6. Fact-checking summary""")
+
+_THINK_RE = re.compile(r'<think>.*?</think>', re.DOTALL)
+_WS_RE = re.compile(r'\s+')
+
+_TRACKING_PARAMS = {'fbclid', 'gclid'}
+
+# Use only the bundled Public Suffix List snapshot: no network fetch or disk cache on first use
+_tld = tldextract.TLDExtract(suffix_list_urls=(), cache_dir=None, include_psl_private_domains=False)
+
+_DEFAULT_HEADERS = {
+    'User-Agent': 'Mozilla/5.0 (Windows NT 10.0; Win64; x64) AppleWebKit/537.36 (KHTML, like Gecko) Chrome/91.0.4472.124 Safari/537.36'
+}
+
+_SKIP_TAGS = ['script', 'style', 'nav', 'footer', 'header']
+_TEXT_TAGS = ['p', 'h1', 'h2', 'h3', 'h4', 'h5', 'h6']
+
+class ScrapeCache:
+    """SQLite store of extracted page text, keyed by URL."""
+
+    def __init__(self, path: Optional[str] = None, expire_after: timedelta = timedelta(days=7)):
+        if path is None:
+            # Share one cache across runs no matter which directory we start from
+            cache_dir = os.path.join(
+                os.environ.get('XDG_CACHE_HOME') or os.path.expanduser('~/.cache'), 'research_assistant'
+            )
+            os.makedirs(cache_dir, exist_ok=True)
+            path = os.path.join(cache_dir, 'scrape_cache.sqlite')
+        self.expire_after = expire_after.total_seconds()
+        # The scraper's event loop may run on a worker thread, so share the
+        # connection across threads and serialize access ourselves
+        self.conn = sqlite3.connect(path, check_same_thread=False)
+        self.lock = threading.Lock()
+        self.conn.execute(
+            'CREATE TABLE IF NOT EXISTS pages (url TEXT PRIMARY KEY, text TEXT NOT NULL, fetched_at REAL NOT NULL)'
+        )
+
+    def get(self, url: str, allow_stale: bool = False) -> Optional[str]:
+        """Return cached text for a URL, or None if missing or expired."""
+        with self.lock:
+            row = self.conn.execute('SELECT text, fetched_at FROM pages WHERE url = ?', (url,)).fetchone()
+        if row is None:
+            return None
+        text, fetched_at = row
+        if not allow_stale and time.time() - fetched_at > self.expire_after:
+            return None
+        return text
+
+    def set(self, url: str, text: str):
+        """Store freshly extracted text for a URL, pruning expired entries."""
+        now = time.time()
+        with self.lock, self.conn:
+            self.conn.execute('DELETE FROM pages WHERE fetched_at < ?', (now - self.expire_after,))
+            self.conn.execute(
+                'INSERT OR REPLACE INTO pages (url, text, fetched_at) VALUES (?, ?, ?)',
+                (url, text, now)
+            )
+
+    def delete(self, urls: List[str]):
+        """Drop cached entries so the next scrape hits the network."""
+        with self.lock, self.conn:
+            self.conn.executemany('DELETE FROM pages WHERE url = ?', [(url,) for url in urls])
+
+def _normalize_url(url: str) -> str:
+    """Canonicalize a URL for caching: lowercase scheme and host, drop fragments and tracking params."""
+    parts = urlsplit(url)
+    query = [
+        (k, v) for k, v in parse_qsl(parts.query, keep_blank_values=True)
+        if k not in _TRACKING_PARAMS and not k.startswith('utm_')
+    ]
+    return urlunsplit((parts.scheme.lower(), parts.netloc.lower(), parts.path, urlencode(query), ''))
 
 class WebScraper:
-    def __init__(self):
-        self.headers = {
-            'User-Agent': 'Mozilla/5.0 (Windows NT 10.0; Win64; x64) AppleWebKit/537.36 (KHTML, like Gecko) Chrome/91.0.4472.124 Safari/537.36'
-        }
-    
-    def extract_text(self, url: str) -> str:
-        """Extract main content text from a webpage."""
+    def __init__(self, per_host_limit: int = 2, host_min_interval: float = 1.0, cache: Optional[ScrapeCache] = None):
+        self.headers = _DEFAULT_HEADERS
+        self.per_host_limit = per_host_limit
+        # Requests to the same host start at least this many seconds apart
+        self._host_min_interval = host_min_interval
+        self._host_last: Dict[str, float] = {}
+        self.cache = cache if cache is not None else ScrapeCache()
+        # In-process tier in front of the SQLite cache, keyed by normalized URL
+        self._cache: Dict[str, str] = {}
+
+    async def extract_text_async(self, client: httpx.AsyncClient, url: str) -> str:
+        """Extract main content text from a webpage using a shared httpx client."""
+        key = _normalize_url(url)
+        cached = self._get_cached(key)
+        if cached is not None:
+            return cached
         try:
-            response = requests.get(url, headers=self.headers, timeout=10)
-            response.raise_for_status()
-            soup = BeautifulSoup(response.text, 'html.parser')
-            
+            async with client.stream('GET', url) as response:
+                response.raise_for_status()
+                if 'html' not in response.headers.get('Content-Type', ''):
+                    text = ''
+                else:
+                    chunks = []
+                    total = 0
+                    async for chunk in response.aiter_bytes(65536):
+                        chunks.append(chunk)
+                        total += len(chunk)
+                        if total > MAX_BODY_BYTES:
+                            break
+                    text = self._parse_html(self._decode_body(b''.join(chunks), response.charset_encoding))
+        except Exception as e:
+            return self._stale_or_empty(url, key, e)
+        self._store(key, text)
+        return text
+
+    def _decode_body(self, body: bytes, charset: Optional[str]) -> str:
+        """Decode a (possibly truncated) body using the declared charset, defaulting to UTF-8."""
+        try:
+            return body.decode(charset or 'utf-8', errors='replace')
+        except LookupError:
+            return body.decode('utf-8', errors='replace')
+
+    def _get_cached(self, key: str) -> Optional[str]:
+        """Look up extracted text in memory, then on disk."""
+        if key in self._cache:
+            return self._cache[key]
+        cached = self.cache.get(key)
+        if cached is not None:
+            self._cache[key] = cached
+        return cached
+
+    def _store(self, key: str, text: str):
+        """Record freshly extracted text in both cache tiers."""
+        self._cache[key] = text
+        self.cache.set(key, text)
+
+    def forget(self, urls: List[str]):
+        """Drop URLs from both cache tiers so the next scrape hits the network."""
+        keys = [_normalize_url(url) for url in urls]
+        for key in keys:
+            self._cache.pop(key, None)
+        self.cache.delete(keys)
+
+    def _stale_or_empty(self, url: str, key: str, error: Exception) -> str:
+        """Fall back to an expired cache entry when a fetch fails, or to no text at all."""
+        stale = self.cache.get(key, allow_stale=True)
+        if stale is not None:
+            return stale
+        # Keep the error out of the prompt; the result is still listed by its search snippet
+        print(f"Error scraping {url}: {str(error)}")
+        return ''
+
+    async def extract_many(self, urls: List[str]) -> List[str]:
+        """Scrape several URLs concurrently over a shared client, capping parallelism per host."""
+        # Semaphores are bound to the running event loop, so build them per call
+        host_limits: Dict[str, asyncio.Semaphore] = {}
+        # Duplicate URLs requested while a fetch is still running share its result
+        in_flight: Dict[str, asyncio.Task] = {}
+
+        # HTTP/2 lets results from the same CDN share one connection
+        async with httpx.AsyncClient(
+            http2=True,
+            headers=self.headers,
+            follow_redirects=True,
+            timeout=httpx.Timeout(10.0, connect=5.0),
+            limits=httpx.Limits(max_connections=20, max_keepalive_connections=10)
+        ) as client:
+            async def limited_fetch(url: str) -> str:
+                # Cache hits never touch the host, so they skip the throttle
+                cached = self._get_cached(_normalize_url(url))
+                if cached is not None:
+                    return cached
+                host = _tld(url).top_domain_under_public_suffix or urlsplit(url).netloc
+                await self._wait_for_host(host)
+                limit = host_limits.setdefault(host, asyncio.Semaphore(self.per_host_limit))
+                async with limit:
+                    return await self.extract_text_async(client, url)
+
+            async def fetch(url: str) -> str:
+                key = _normalize_url(url)
+                if key not in in_flight:
+                    in_flight[key] = asyncio.ensure_future(limited_fetch(url))
+                return await in_flight[key]
+
+            return await asyncio.gather(*[fetch(url) for url in urls])
+
+    async def _wait_for_host(self, host: str):
+        """Sleep until this host's next request slot, reserving it before yielding."""
+        now = time.monotonic()
+        start = max(now, self._host_last.get(host, 0.0) + self._host_min_interval)
+        self._host_last[host] = start
+        if start > now:
+            await asyncio.sleep(start - now)
+
+    def _parse_html(self, html: str) -> str:
+        """Extract headings and paragraph text from raw HTML."""
+        if HTMLParser is not None:
+            tree = HTMLParser(html)
             # Remove unwanted elements
-            for element in soup(['script', 'style', 'nav', 'footer', 'header']):
-                element.decompose()
-            
+            tree.strip_tags(_SKIP_TAGS)
             # Extract text from paragraphs and headings
-            text_elements = soup.find_all(['p', 'h1', 'h2', 'h3', 'h4', 'h5', 'h6'])
-            text = ' '.join([elem.get_text().strip() for elem in text_elements])
-            
-            # Clean up text
-            text = re.sub(r'\s+', ' ', text)
-            return text[:5000]  # Limit text length
-        except Exception as e:
-            return f"Error scraping {url}: {str(e)}"
+            text_elements = tree.css(','.join(_TEXT_TAGS))
+            text = ' '.join([t for elem in text_elements if (t := elem.text().strip())])
+        else:
+            soup = BeautifulSoup(html, 'lxml')
+            for element in soup(_SKIP_TAGS):
+                element.decompose()
+            text_elements = soup.find_all(_TEXT_TAGS)
+            text = ' '.join([t for elem in text_elements if (t := elem.get_text().strip())])
+
+        # Clean up text
+        text = _WS_RE.sub(' ', text)
+        return text[:5000]  # Limit text length
 
 class ResearchAssistant:
-    def __init__(self, model: str = "deepseek-r1:8b"):
+    def __init__(
+        self,
+        model: str = "deepseek-r1:8b",
+        base_url: str = "http://localhost:11434",
+        num_predict: int = 2048,
+        temperature: float = 0.6
+    ):
         self.model = model
-        self.base_url = "http://localhost:11434/api/generate"
+        self.base_url = base_url
+        # Every request must send the same options, or Ollama reloads the model.
+        # Capping num_predict bounds decode time, which dominates each call.
+        self.options = {
+            "num_ctx": 8192,
+            "num_predict": num_predict,
+            "temperature": temperature
+        }
         self.scraper = WebScraper()
         self.ddgs = DDGS()
+        # Keep connections to Ollama alive across the depth + 2 model calls
+        self.session = requests.Session()
+        self.session.mount('http://', HTTPAdapter(
+            pool_connections=4,
+            pool_maxsize=OLLAMA_POOL_SIZE,
+            max_retries=Retry(total=3, backoff_factor=0.2)
+        ))
+        # Request bodies are pre-serialized with orjson and sent as raw bytes
+        self.session.headers['Content-Type'] = 'application/json'
+        # Failed searches raise out of the cached call, so they are never memoized
+        self._cached_search = lru_cache(maxsize=32)(self._fetch_search_results)
+        # Load the model in the background while the web search runs
+        threading.Thread(target=self._warm_up, daemon=True).start()
+
+    def _warm_up(self):
+        """Ask Ollama to load the model into memory without generating anything."""
+        payload = {
+            "model": self.model,
+            "keep_alive": KEEP_ALIVE,
+            "options": self.options
+        }
+        try:
+            self.session.post(f"{self.base_url}/api/generate", data=orjson.dumps(payload), timeout=(5, 300))
+        except requests.exceptions.RequestException:
+            # The first real request will surface any connection problem
+            pass
         
+    def _fetch_search_results(self, query: str, max_results: int) -> Tuple[Dict[str, str], ...]:
+        """Run a DuckDuckGo text search and normalize the result fields."""
+        return tuple(
+            {
+                'title': r['title'],
+                'url': r['link'],
+                'snippet': r['body']
+            }
+            for r in self.ddgs.text(query, max_results=max_results)
+        )
+
     def _search_web(self, query: str, max_results: int = 5) -> List[Dict[str, str]]:
         """Search the web using DuckDuckGo."""
         try:
-            results = []
-            for r in self.ddgs.text(query, max_results=max_results):
-                results.append({
-                    'title': r['title'],
-                    'url': r['link'],
-                    'snippet': r['body']
-                })
-            return results
+            # Copy the cached dicts since research() adds scraped content to them
+            return [dict(r) for r in self._cached_search(query, max_results)]
         except Exception as e:
             print(f"Search error: {str(e)}")
             return []
 
-    def _create_research_prompt(self, question: str, web_results: List[Dict[str, str]]) -> str:
-        """Create a structured prompt for deep research with web results."""
+    async def _search_and_scrape(self, query: str, max_results: int, force_refresh: bool = False) -> List[Dict[str, str]]:
+        """Search the web off the event loop, then scrape every result concurrently."""
+        # DDGS.text() returns the full list at once, so there is nothing to overlap with the search itself
+        web_results = await asyncio.to_thread(self._search_web, query, max_results)
+        urls = [r['url'] for r in web_results]
+        if force_refresh:
+            self.scraper.forget(urls)
+        contents = await self.scraper.extract_many(urls)
+        for result, content in zip(web_results, contents):
+            result['content'] = content[:MAX_CONTEXT_CHARS]
+        return web_results
+
+    def _format_web_context(self, web_results: List[Dict[str, str]], start: int = 1) -> str:
+        """Render search results and their scraped content for inclusion in a prompt."""
         web_context = "\n\nWeb Search Results:\n"
-        for i, result in enumerate(web_results, 1):
+        for i, result in enumerate(web_results, start):
             web_context += f"\n{i}. {result['title']}\n"
             web_context += f"   URL: {result['url']}\n"
             web_context += f"   Summary: {result['snippet']}\n"
-        
-        return f"""You are a research assistant tasked with providing a comprehensive analysis of the following question:
-
-{question}
-
-{web_context}
-
-Please provide a detailed response that includes:
-1. Key concepts and definitions
-2. Historical context (if relevant)
-3. Current state of knowledge
-4. Different perspectives or viewpoints
-5. Supporting evidence and examples
-6. Potential implications
-7. Areas for further research
-8. Citations and sources (include URLs from the web results)
+            if result.get('content'):
+                web_context += f"   Content: {result['content']}\n"
+        return web_context
 
-Structure your response in a clear, academic format with appropriate sections and subsections."""
+    def _format_source_list(self, web_results: List[Dict[str, str]]) -> str:
+        """List sources by number and URL only, for prompts that already saw the full context."""
+        return "\n".join(f"[{i}] {r['url']}" for i, r in enumerate(web_results, 1))
 
-    def _create_analysis_prompt(self, question: str, initial_response: str, web_results: List[Dict[str, str]]) -> str:
-        """Create a prompt for deeper analysis of the initial response."""
-        web_context = "\n\nWeb Search Results:\n"
-        for i, result in enumerate(web_results, 1):
-            web_context += f"\n{i}. {result['title']}\n"
-            web_context += f"   URL: {result['url']}\n"
-            web_context += f"   Summary: {result['snippet']}\n"
-        
-        return f"""Based on the following research question, initial response, and web search results, provide a deeper analysis:
+    def _create_research_prompt(self, question: str, web_context: str) -> str:
+        """Create a structured prompt for deep research with web results."""
+        return _RESEARCH_TEMPLATE.substitute(question=question, web_context=web_context)
 
-Question: {question}
+    def _create_analysis_prompt(self, index: int, extra_context: str = "") -> str:
+        """Create a follow-up turn asking for deeper analysis of the previous answer."""
+        prompt = _ANALYSIS_TEMPLATE.substitute(focus=_ANALYSIS_FOCUSES[index % len(_ANALYSIS_FOCUSES)])
+        if extra_context:
+            return f"Additional sources gathered while you were answering:{extra_context}\n{prompt}"
+        return prompt
 
-Initial Response:
-{initial_response}
+    def _create_synthesis_prompt(self, source_list: str, analyses: List[str]) -> str:
+        """Create the closing turn asking for a synthesis of the whole conversation."""
+        # Split the budget evenly so every critique is represented
+        per_critique = MAX_CRITIQUE_CHARS // max(len(analyses), 1)
+        rendered = "\n\n".join(
+            f"Critique {i}:\n{_THINK_RE.sub('', analysis).strip()[:per_critique]}"
+            for i, analysis in enumerate(analyses, 1)
+        )
+        return _SYNTHESIS_TEMPLATE.substitute(source_list=source_list, analyses=rendered)
 
-{web_context}
+    async def _prefetch_sources(
+        self,
+        question: str,
+        count: int,
+        seen_urls: Set[str],
+        force_refresh: bool = False
+    ) -> List[Dict[str, str]]:
+        """Search for and scrape further results beyond the ones already used."""
+        if count <= 0:
+            return []
+        candidates = await asyncio.to_thread(self._search_web, question, len(seen_urls) + count)
+        extra = [r for r in candidates if r['url'] not in seen_urls][:count]
+        if force_refresh:
+            self.scraper.forget([r['url'] for r in extra])
+        contents = await self.scraper.extract_many([r['url'] for r in extra])
+        for result, content in zip(extra, contents):
+            result['content'] = content[:MAX_CONTEXT_CHARS]
+        return extra
 
-Please provide:
-1. Critical analysis of the information presented
-2. Identification of any gaps or limitations
-3. Connections to related fields or concepts
-4. Practical applications or implications
-5. Recommendations for further investigation
-6. Fact-checking against web sources
-7. Additional insights from web sources"""
+    async def _ask_with_prefetch(
+        self,
+        messages: List[Dict[str, str]],
+        question: str,
+        count: int,
+        seen_urls: Set[str],
+        on_token: Optional[Callable[[str], None]],
+        force_refresh: bool = False
+    ) -> Tuple[str, List[Dict[str, str]]]:
+        """Generate a reply while fetching extra sources for the next turn in the background."""
+        prefetch = asyncio.create_task(self._prefetch_sources(question, count, seen_urls, force_refresh))
+        reply = await asyncio.to_thread(self._ask, messages, None, on_token)
+        return reply, await prefetch
 
-    def research(self, question: str, depth: int = 2, max_web_results: int = 5) -> Dict[str, Any]:
+    def research(
+        self,
+        question: str,
+        depth: int = 2,
+        max_web_results: int = 5,
+        force_refresh: bool = False,
+        extra_web_results: int = 3,
+        on_token: Optional[Callable[[str], None]] = None
+    ) -> Dict[str, Any]:
         """
         Conduct deep research on a given question with web search capabilities.
         
         Args:
             question: The research question to investigate
-            depth: Number of analysis iterations (default: 2)
+            depth: Number of independent analyses run in parallel (default: 2)
             max_web_results: Maximum number of web results to include (default: 5)
+            force_refresh: Ignore cached search results and page content (default: False)
+            extra_web_results: Additional results to fetch during the initial research and
+                add to the analyses (default: 3)
+            on_token: Optional callback receiving generated text as it streams, followed
+                by a newline at the end of each reply
             
         Returns:
             Dictionary containing the research results and analysis
@@ -130,85 +484,136 @@ Please provide:
             "final_conclusions": None
         }
         
-        # Perform web search
-        print("Searching the web...")
-        web_results = self._search_web(question, max_web_results)
+        # Perform the web search, then scrape all of its results concurrently
+        print("Searching and scraping the web...")
+        if force_refresh:
+            self._cached_search.cache_clear()
+        web_results = asyncio.run(self._search_and_scrape(question, max_web_results, force_refresh))
         results["web_results"] = web_results
         
-        # Scrape content from web results
-        print("Scraping web content...")
-        for result in web_results:
-            content = self.scraper.extract_text(result['url'])
-            result['content'] = content
-            time.sleep(1)  # Be nice to servers
+        # The web context is sent once as the opening turn; later turns only
+        # append to the conversation so Ollama can reuse its cached prefix
+        web_context = self._format_web_context(web_results)
+        messages = [
+            {"role": "system", "content": SYSTEM_PROMPT},
+            {"role": "user", "content": self._create_research_prompt(question, web_context)}
+        ]
         
-        # Initial research
+        # Initial research, overlapped with fetching extra sources for the analysis turns
         print("Conducting initial research...")
-        initial_prompt = self._create_research_prompt(question, web_results)
-        initial_response = self._query_model(initial_prompt)
-        results["initial_research"] = initial_response
+        if depth <= 0:
+            extra_web_results = 0
+        seen_urls = {r['url'] for r in web_results}
+        results["initial_research"], extra_results = asyncio.run(
+            self._ask_with_prefetch(messages, question, extra_web_results, seen_urls, on_token, force_refresh)
+        )
+        extra_context = self._format_web_context(extra_results, start=len(web_results) + 1) if extra_results else ""
+        # Extra sources only reach the analysis branches, so the synthesis lists just the ones it has seen
+        source_list = self._format_source_list(web_results)
+        web_results.extend(extra_results)
         
-        # Deep analysis iterations
-        current_response = initial_response
-        for i in range(depth):
-            print(f"Performing analysis iteration {i+1}...")
-            analysis_prompt = self._create_analysis_prompt(question, current_response, web_results)
-            analysis_response = self._query_model(analysis_prompt)
-            results["analysis"].append(analysis_response)
-            current_response = analysis_response
+        # Independent analyses of the initial research, run concurrently. Each branch
+        # shares the conversation prefix, so Ollama can serve them from one cache
+        # and batch them when OLLAMA_NUM_PARALLEL allows.
+        if depth > 0:
+            print(f"Performing {depth} analyses in parallel...")
+            branches = [
+                messages + [{"role": "user", "content": self._create_analysis_prompt(i, extra_context)}]
+                for i in range(depth)
+            ]
+            with ThreadPoolExecutor(max_workers=min(depth, OLLAMA_POOL_SIZE)) as executor:
+                results["analysis"] = list(executor.map(self._ask, branches, map(self._branch_options, range(depth))))
         
         # Final synthesis
         print("Generating final synthesis...")
-        synthesis_prompt = f"""Based on the following research question, all previous analyses, and web search results, provide a final synthesis:
-
-Question: {question}
-
-Initial Research:
-{results['initial_research']}
-
-Analysis Iterations:
-{json.dumps(results['analysis'], indent=2)}
+        synthesis_prompt = self._create_synthesis_prompt(source_list, results["analysis"])
+        messages.append({"role": "user", "content": synthesis_prompt})
+        results["final_conclusions"] = self._ask(messages, on_token=on_token)
+        return results
 
-Web Results:
-{json.dumps(web_results, indent=2)}
+    def _branch_options(self, index: int) -> Optional[Dict[str, Any]]:
+        """Sampling overrides for an analysis branch whose focus repeats an earlier one."""
+        repeat = index // len(_ANALYSIS_FOCUSES)
+        if repeat == 0:
+            return None
+        # Sampling options don't force a model reload, unlike num_ctx
+        return {"seed": index, "temperature": self.options["temperature"] + 0.1 * repeat}
 
-Please provide:
-1. A comprehensive synthesis of all findings
-2. Key takeaways and conclusions
-3. Practical implications
-4. Recommendations for further research
-5. Citations and sources
-6. Fact-checking summary"""
-        
-        results["final_conclusions"] = self._query_model(synthesis_prompt)
-        return results
+    def _ask(
+        self,
+        messages: List[Dict[str, str]],
+        options: Optional[Dict[str, Any]] = None,
+        on_token: Optional[Callable[[str], None]] = None
+    ) -> str:
+        """Send the conversation to the model and record its reply in the history."""
+        reply = self._chat(messages, options, on_token)
+        if on_token is not None:
+            # Terminate the streamed reply before the next status line
+            on_token("\n")
+        # Reasoning traces are not needed as context for later turns
+        messages.append({"role": "assistant", "content": _THINK_RE.sub('', reply).strip()})
+        return reply
 
-    def _query_model(self, prompt: str) -> str:
-        """Query the Ollama model with the given prompt."""
+    def _chat(
+        self,
+        messages: List[Dict[str, str]],
+        options: Optional[Dict[str, Any]] = None,
+        on_token: Optional[Callable[[str], None]] = None
+    ) -> str:
+        """Query the Ollama chat endpoint with the given conversation, streaming the reply."""
         payload = {
             "model": self.model,
-            "prompt": prompt,
-            "stream": False
+            "messages": messages,
+            "stream": True,
+            "keep_alive": KEEP_ALIVE,
+            "options": {**self.options, **options} if options else self.options
         }
         
         try:
-            response = requests.post(self.base_url, json=payload)
-            response.raise_for_status()
-            result = response.json()
-            return result['response']
-        except requests.exceptions.RequestException as e:
+            with self.session.post(f"{self.base_url}/api/chat", data=orjson.dumps(payload), timeout=(5, 300), stream=True) as response:
+                response.raise_for_status()
+                parts = []
+                for line in response.iter_lines():
+                    if not line:
+                        continue
+                    chunk = orjson.loads(line)
+                    if 'error' in chunk:
+                        return f"Error: {chunk['error']}"
+                    token = chunk.get('message', {}).get('content', '')
+                    if token:
+                        parts.append(token)
+                        if on_token is not None:
+                            on_token(token)
+                    if chunk.get('done'):
+                        break
+                return ''.join(parts)
+        except (requests.exceptions.RequestException, orjson.JSONDecodeError) as e:
             return f"Error: {str(e)}"
 
 def main():
     parser = argparse.ArgumentParser(description='Deep Research Assistant using Ollama with Web Search')
     parser.add_argument('question', help='The research question to investigate')
-    parser.add_argument('--depth', type=int, default=2, help='Number of analysis iterations (default: 2)')
+    parser.add_argument('--depth', type=int, default=2, help='Number of independent analyses run in parallel (default: 2)')
     parser.add_argument('--web-results', type=int, default=5, help='Maximum number of web results to include (default: 5)')
+    parser.add_argument('--extra-web-results', type=int, default=3, help='Extra results fetched during initial research for the analyses (default: 3)')
+    parser.add_argument('--stream', action='store_true', help='Print model output as it is generated')
+    parser.add_argument('--force-refresh', action='store_true', help='Ignore cached search results and page content')
+    parser.add_argument('--model', default='deepseek-r1:8b', help='Ollama model tag, e.g. a specific quantization (default: deepseek-r1:8b)')
+    parser.add_argument('--num-predict', type=int, default=2048, help='Maximum tokens generated per model call (default: 2048)')
+    parser.add_argument('--temperature', type=float, default=0.6, help='Sampling temperature (default: 0.6)')
     parser.add_argument('--output', help='Output file path for saving results (optional)')
     args = parser.parse_args()
     
-    assistant = ResearchAssistant()
-    results = assistant.research(args.question, args.depth, args.web_results)
+    assistant = ResearchAssistant(args.model, num_predict=args.num_predict, temperature=args.temperature)
+    on_token = (lambda token: print(token, end='', flush=True)) if args.stream else None
+    results = assistant.research(
+        args.question,
+        args.depth,
+        args.web_results,
+        args.force_refresh,
+        args.extra_web_results,
+        on_token
+    )
     
     # Print results
     print("\nResearch Results:")
@@ -227,7 +632,7 @@ def main():
     print(results['initial_research'])
     
     for i, analysis in enumerate(results['analysis'], 1):
-        print(f"\nAnalysis Iteration {i}:")
+        print(f"\nAnalysis {i}:")
         print("-" * 40)
         print(analysis)
     
@@ -237,8 +642,8 @@ def main():
     
     # Save results to file if output path is provided
     if args.output:
-        with open(args.output, 'w', encoding='utf-8') as f:
-            json.dump(results, f, indent=2, ensure_ascii=False)
+        with open(args.output, 'wb') as f:
+            f.write(orjson.dumps(results, option=orjson.OPT_INDENT_2 | orjson.OPT_NON_STR_KEYS))
         print(f"\nResults saved to: {args.output}")
 
 if __name__ == "__main__":